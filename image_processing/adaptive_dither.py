@@ -4,124 +4,194 @@ Adaptive Floyd-Steinberg dithering for different lighting conditions
 """
 
 import sys
-from PIL import Image, ImageEnhance, ImageFilter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from PIL import Image
 import numpy as np
 from pathlib import Path
 
-def dither_for_lowlight(image):
-    """Optimize dithering for low-light/dark photos"""
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional - without it the kernel runs as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# Compiled kernels are cached on disk, and numba's cache records the name of
+# the module that compiled them - so this file is only ever imported as
+# image_processing.adaptive_dither, even when it is run as a script
+@njit(cache=True, fastmath=True, boundscheck=False, inline='always')
+def _fs_pixel(a, packed, y, x, threshold):
+    """Quantize one fixed-point pixel and diffuse its error to the neighbours"""
+    h, w = a.shape
+    old_pixel = int(a[y, x])
+    # Branchless threshold - the comparison is unpredictable on photos
+    white = int(old_pixel > threshold)
+    new_pixel = white * (255 << 4)
+    a[y, x] = white * 255
+    # Black pixels are the ones that print: set their bit, MSB first
+    packed[y, x >> 3] |= (1 - white) << (7 - (x & 7))
+    error = old_pixel - new_pixel
+    
+    if x + 1 < w:
+        a[y, x + 1] += (error * 7) >> 4
+    if y + 1 < h:
+        if x > 0:
+            a[y + 1, x - 1] += (error * 3) >> 4
+        a[y + 1, x] += (error * 5) >> 4
+        if x + 1 < w:
+            a[y + 1, x + 1] += error >> 4
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _fs_dither(a, threshold, packed):
+    """
+    Floyd-Steinberg error diffusion, in place, on a 2D int16 array.
+    
+    Pixels come in as 4-bit fixed point (value << 4) so the x/16 error
+    weights are exact integer shifts; each pixel is written back as 0/255.
+    The same result is also OR-ed into `packed` (see _new_raster) as
+    raster rows with 1 = black, MSB first, ready for ESC/POS GS v 0.
+    """
+    h, w = a.shape
+    threshold = threshold * 16
+    # Rows are diffused in pairs within one sweep. The second row trails
+    # the first by one pixel, which is exactly when all of its error has
+    # arrived, so the result matches a row-by-row pass.
+    # Plain 2D indexing is deliberate: LLVM already hoists the row base
+    # pointers, while passing a[y] row views into _fs_pixel costs a
+    # reference count per pixel and measured ~10x slower
+    for y in range(0, h, 2):
+        for x in range(w + 1):
+            if x < w:
+                _fs_pixel(a, packed, y, x, threshold)
+            if x > 0 and y + 1 < h:
+                _fs_pixel(a, packed, y + 1, x - 1, threshold)
+
+def _new_raster(shape):
+    """Zeroed packed 1-bit buffer for an image of the given (h, w) shape"""
+    h, w = shape
+    return np.zeros((h, (w + 7) // 8), dtype=np.uint8)
+
+@lru_cache(maxsize=16)
+def _gamma_lut(gamma):
+    """256-entry float32 table mapping 8-bit values through a gamma curve"""
+    lut = (255 * np.power(np.arange(256) / 255, gamma)).astype(np.float32)
+    lut.setflags(write=False)
+    return lut
+
+def _percentiles_u8(u8, pcts):
+    """Percentiles of an 8-bit image from one 256-bin histogram"""
+    cdf = np.cumsum(np.bincount(u8.ravel(), minlength=256))
+    return np.searchsorted(cdf, np.asarray(pcts) * cdf[-1] / 100)
+
+@dataclass(frozen=True)
+class DitherParams:
+    """Tone curve and threshold for one lighting mode"""
+    gamma: float
+    threshold: float
+    # Percentile histogram stretch (skipped when pct_lo is None)
+    pct_lo: Optional[float] = None
+    pct_hi: Optional[float] = None
+    stretch: float = 255
+    min_span: float = 0
+    # Highlight compression above the knee (skipped when knee is None)
+    knee: Optional[float] = None
+    knee_slope: float = 1.0
+
+# Aggressive brightening and stretch, lower threshold for dark images
+LOWLIGHT_PARAMS = DitherParams(gamma=0.5, threshold=90,
+                               pct_lo=2, pct_hi=98, stretch=300, min_span=10)
+
+# Mild gamma and standard stretch for normal lighting
+AUTO_PARAMS = DitherParams(gamma=0.9, threshold=128,
+                           pct_lo=5, pct_hi=95, stretch=255, min_span=20)
+
+# Mild darkening with gentle highlight compression for bright images
+BRIGHT_PARAMS = DitherParams(gamma=1.3, threshold=135,
+                             knee=220, knee_slope=0.5)
+
+MODES = {
+    'lowlight': LOWLIGHT_PARAMS,
+    'auto': AUTO_PARAMS,
+    'bright': BRIGHT_PARAMS,
+}
+
+def _preprocess(u8, p):
+    """Apply the gamma, stretch and highlight curve of a mode"""
+    # Every stage is a per-value function of the 8-bit input, so the whole
+    # curve is built on a 256-entry table and applied with one lookup
+    lut = _gamma_lut(p.gamma)
+    
+    if p.pct_lo is not None:
+        # Gamma is monotonic, so percentiles map straight through the LUT
+        percentile_low, percentile_high = lut[_percentiles_u8(u8, (p.pct_lo, p.pct_hi))]
+        if percentile_high - percentile_low > p.min_span:
+            lut = np.clip((lut - percentile_low) * p.stretch / (percentile_high - percentile_low), 0, 255)
+    
+    if p.knee is not None:
+        lut = np.where(lut > p.knee,
+                       p.knee + (lut - p.knee) * p.knee_slope,
+                       lut)
+    
+    # Fixed-point (value << 4) table for the integer dither kernel
+    return np.rint(lut * 16).astype(np.int16)[u8]
+
+def _dither_arrays(image, params):
+    """Dither an image, returning both the 0/255 pixels and the packed raster"""
     img = image.convert('L')
-    img_array = np.array(img, dtype=float)
+    img_array = _preprocess(np.asarray(img, dtype=np.uint8), params)
+    packed = _new_raster(img_array.shape)
     
-    # Aggressive brightening for low light
-    gamma = 0.5  # Strong brightening
-    img_array = 255 * np.power(img_array / 255, gamma)
+    _fs_dither(img_array, params.threshold, packed)
     
-    # Stretch histogram aggressively
-    percentile_low = np.percentile(img_array, 2)
-    percentile_high = np.percentile(img_array, 98)
-    if percentile_high - percentile_low > 10:
-        img_array = np.clip((img_array - percentile_low) * 300 / (percentile_high - percentile_low), 0, 255)
+    return img_array, packed
+
+def _dither(image, params):
+    """Preprocess and Floyd-Steinberg dither an image with the given params"""
+    img_array, _ = _dither_arrays(image, params)
+    return Image.fromarray(img_array.astype(np.uint8))
+
+def dither_to_raster(image, params=AUTO_PARAMS):
+    """
+    Dither an image straight to packed raster rows (1 = black, MSB first).
+    
+    This is the byte layout the printer expects after a GS v 0 header,
+    so no further conversion or bit packing is needed.
+    """
+    return _dither_arrays(image, params)[1]
+
+def load_image(input_path, width=576):
+    """Load an image as grayscale and resize it to receipt width"""
+    img = Image.open(input_path)
     
-    # Lower threshold for dark images
-    threshold = 90
+    # Calculate height maintaining aspect ratio
+    aspect = img.height / img.width
+    height = int(width * aspect)
     
-    # Floyd-Steinberg dithering
-    h, w = img_array.shape
-    for y in range(h):
-        for x in range(w):
-            old_pixel = img_array[y, x]
-            new_pixel = 255 if old_pixel > threshold else 0
-            img_array[y, x] = new_pixel
-            error = old_pixel - new_pixel
-            
-            if x + 1 < w:
-                img_array[y, x + 1] += error * 7 / 16
-            if y + 1 < h:
-                if x > 0:
-                    img_array[y + 1, x - 1] += error * 3 / 16
-                img_array[y + 1, x] += error * 5 / 16
-                if x + 1 < w:
-                    img_array[y + 1, x + 1] += error * 1 / 16
+    # Let JPEG decode straight to grayscale at a reduced scale, then
+    # resize a single channel instead of three
+    img.draft('L', (width, height))
+    if img.mode != 'L':
+        img = img.convert('L')
     
-    return Image.fromarray(np.clip(img_array, 0, 255).astype(np.uint8))
+    return img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+def dither_for_lowlight(image):
+    """Optimize dithering for low-light/dark photos"""
+    return _dither(image, LOWLIGHT_PARAMS)
 
 def dither_for_auto(image):
     """Standard dithering for normal lighting"""
-    img = image.convert('L')
-    img_array = np.array(img, dtype=float)
-    
-    # Mild gamma adjustment
-    gamma = 0.9
-    img_array = 255 * np.power(img_array / 255, gamma)
-    
-    # Standard histogram stretch
-    percentile_low = np.percentile(img_array, 5)
-    percentile_high = np.percentile(img_array, 95)
-    if percentile_high - percentile_low > 20:
-        img_array = np.clip((img_array - percentile_low) * 255 / (percentile_high - percentile_low), 0, 255)
-    
-    # Standard threshold
-    threshold = 128
-    
-    # Floyd-Steinberg dithering
-    h, w = img_array.shape
-    for y in range(h):
-        for x in range(w):
-            old_pixel = img_array[y, x]
-            new_pixel = 255 if old_pixel > threshold else 0
-            img_array[y, x] = new_pixel
-            error = old_pixel - new_pixel
-            
-            if x + 1 < w:
-                img_array[y, x + 1] += error * 7 / 16
-            if y + 1 < h:
-                if x > 0:
-                    img_array[y + 1, x - 1] += error * 3 / 16
-                img_array[y + 1, x] += error * 5 / 16
-                if x + 1 < w:
-                    img_array[y + 1, x + 1] += error * 1 / 16
-    
-    return Image.fromarray(np.clip(img_array, 0, 255).astype(np.uint8))
+    return _dither(image, AUTO_PARAMS)
 
 def dither_for_bright(image):
     """Optimize dithering for bright/overexposed photos"""
-    img = image.convert('L')
-    img_array = np.array(img, dtype=float)
-    
-    # Mild darkening to recover highlights
-    gamma = 1.3  # Reduced from 1.8 - much milder darkening
-    img_array = 255 * np.power(img_array / 255, gamma)
-    
-    # Compress highlights gently
-    img_array = np.where(img_array > 220, 
-                        220 + (img_array - 220) * 0.5,  # Gentler compression
-                        img_array)
-    
-    # Slightly higher threshold for bright images
-    threshold = 135  # Reduced from 145
-    
-    # Floyd-Steinberg dithering
-    h, w = img_array.shape
-    for y in range(h):
-        for x in range(w):
-            old_pixel = img_array[y, x]
-            new_pixel = 255 if old_pixel > threshold else 0
-            img_array[y, x] = new_pixel
-            error = old_pixel - new_pixel
-            
-            if x + 1 < w:
-                img_array[y, x + 1] += error * 7 / 16
-            if y + 1 < h:
-                if x > 0:
-                    img_array[y + 1, x - 1] += error * 3 / 16
-                img_array[y + 1, x] += error * 5 / 16
-                if x + 1 < w:
-                    img_array[y + 1, x + 1] += error * 1 / 16
-    
-    return Image.fromarray(np.clip(img_array, 0, 255).astype(np.uint8))
+    return _dither(image, BRIGHT_PARAMS)
 
-if __name__ == "__main__":
+def main():
     if len(sys.argv) != 3:
         print("Usage: python adaptive_dither.py <input.jpg> <mode>")
         print("Modes: lowlight, auto, bright")
@@ -130,24 +200,25 @@ if __name__ == "__main__":
     input_file = sys.argv[1]
     mode = sys.argv[2]
     
-    img = Image.open(input_file)
+    # Load at receipt width
+    img = load_image(input_file)
     
-    # Resize to receipt width
-    aspect = img.height / img.width
-    img = img.resize((576, int(576 * aspect)), Image.Resampling.LANCZOS)
-    
-    if mode == "lowlight":
-        result = dither_for_lowlight(img)
-    elif mode == "auto":
-        result = dither_for_auto(img)
-    elif mode == "bright":
-        result = dither_for_bright(img)
-    else:
+    if mode not in MODES:
         print(f"Unknown mode: {mode}")
         sys.exit(1)
+    raster = dither_to_raster(img, MODES[mode])
+    # PIL packs mode '1' the same way, only with 1 = white
+    result = Image.frombytes('1', img.size, np.invert(raster).tobytes())
     
     # Save with appropriate name
     base = Path(input_file).stem
     output = f"{base}_{mode}_receipt.jpg"
-    result.convert('1').save(output, 'JPEG')
-    print(f"Saved to {output}")
\ No newline at end of file
+    result.save(output, 'JPEG')
+    print(f"Saved to {output}")
+
+if __name__ == "__main__":
+    # Run the package copy of this module, so the kernels only ever load
+    # under one name
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from image_processing.adaptive_dither import main
+    main()
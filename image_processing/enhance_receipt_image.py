@@ -6,70 +6,76 @@ Optimized for Raspberry Pi Zero with various artistic filters
 
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from PIL import Image, ImageFilter, ImageOps, ImageEnhance
 import numpy as np
 from pathlib import Path
 
+# Import the dither kernel under one module name however this file is run
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from image_processing.adaptive_dither import _fs_dither, _gamma_lut, _new_raster, _percentiles_u8, load_image
+
+def _to_f32(img):
+    """View an 8-bit PIL image through the buffer protocol, copy once to float32"""
+    return np.asarray(img, dtype=np.uint8).astype(np.float32)
+
+def _color_dodge(base, blend):
+    """Color dodge blend of two float32 grayscale arrays, clipped to 0-255"""
+    result = base * 255
+    divisor = 255 - blend
+    # Where the blend is pure white the result stays base * 255, which the
+    # clip below turns into white (or black for a black base)
+    np.divide(result, divisor, out=result, where=divisor > 0)
+    return np.minimum(result, 255, out=result)
+
 def floyd_steinberg_dither(image):
     """Apply Floyd-Steinberg dithering optimized for receipt printer"""
     img = image.convert('L')
     
     # Pre-process to handle over-exposure and improve contrast
-    img_array = np.array(img, dtype=float)
+    u8 = np.asarray(img, dtype=np.uint8)
     
     # 1. Check if image is over-exposed (too bright)
-    mean_brightness = np.mean(img_array)
+    mean_brightness = np.mean(u8)
     
     if mean_brightness > 180:  # Over-exposed image
         # Apply stronger gamma to darken
         gamma = 1.5  # Greater than 1 darkens
-        img_array = 255 * np.power(img_array / 255, gamma)
     elif mean_brightness < 80:  # Under-exposed image
         # Apply lighter gamma to brighten
         gamma = 0.7  # Less than 1 brightens
-        img_array = 255 * np.power(img_array / 255, gamma)
     else:
         # Normal exposure - mild adjustment
         gamma = 1.1
-        img_array = 255 * np.power(img_array / 255, gamma)
+    lut = _gamma_lut(gamma)
     
     # 2. Improve contrast using histogram stretching
-    percentile_low = np.percentile(img_array, 5)
-    percentile_high = np.percentile(img_array, 95)
+    percentile_low, percentile_high = lut[_percentiles_u8(u8, (5, 95))]
     
     # More aggressive stretching for better definition
     if percentile_high - percentile_low > 20:
-        img_array = np.clip((img_array - percentile_low) * 255 / (percentile_high - percentile_low), 0, 255)
+        lut = np.clip((lut - percentile_low) * 255 / (percentile_high - percentile_low), 0, 255)
+    
+    # Gamma and stretch are folded into the table, applied in one lookup
+    img_temp = img.point(lut.astype(np.uint8).tolist())
     
     # 3. Apply mild sharpening for detail preservation
-    img_temp = Image.fromarray(img_array.astype(np.uint8))
     img_temp = img_temp.filter(ImageFilter.UnsharpMask(radius=1, percent=100, threshold=2))
-    img_array = np.array(img_temp, dtype=float)
+    sharpened = np.asarray(img_temp, dtype=np.uint8)
     
     # 4. Apply Floyd-Steinberg dithering with adaptive threshold
-    h, w = img_array.shape
-    
     # Calculate adaptive threshold based on image brightness
-    mean_brightness = np.mean(img_array)
+    mean_brightness = np.mean(sharpened)
     threshold = 110 if mean_brightness < 100 else 128  # Lower threshold for dark images
     
-    for y in range(h):
-        for x in range(w):
-            old_pixel = img_array[y, x]
-            new_pixel = 255 if old_pixel > threshold else 0
-            img_array[y, x] = new_pixel
-            error = old_pixel - new_pixel
-            
-            if x + 1 < w:
-                img_array[y, x + 1] += error * 7 / 16
-            if y + 1 < h:
-                if x > 0:
-                    img_array[y + 1, x - 1] += error * 3 / 16
-                img_array[y + 1, x] += error * 5 / 16
-                if x + 1 < w:
-                    img_array[y + 1, x + 1] += error * 1 / 16
-    
-    return Image.fromarray(np.clip(img_array, 0, 255).astype(np.uint8))
+    # The integer kernel works on 4-bit fixed point pixels
+    img_array = sharpened.astype(np.int16) << 4
+    packed = _new_raster(img_array.shape)
+    _fs_dither(img_array, threshold, packed)
+    
+    # Build the 1-bit result from the packed rows (PIL uses 1 = white)
+    return Image.frombytes('1', image.size, np.invert(packed).tobytes())
 
 def sketch_effect(image):
     """Convert image to sketch-like appearance"""
@@ -83,12 +89,11 @@ def sketch_effect(image):
     blurred = inverted.filter(ImageFilter.GaussianBlur(radius=10))
     
     # Blend the grayscale and blurred inverted using color dodge
-    gray_array = np.array(gray, dtype=float)
-    blurred_array = np.array(blurred, dtype=float)
+    gray_array = _to_f32(gray)
+    blurred_array = _to_f32(blurred)
     
     # Color dodge blend mode
-    result = gray_array * 255 / (255 - blurred_array + 1e-10)
-    result = np.clip(result, 0, 255)
+    result = _color_dodge(gray_array, blurred_array)
     
     sketch = Image.fromarray(result.astype(np.uint8))
     
@@ -120,64 +125,33 @@ def halftone_effect(image, dot_size=4):
     """Create halftone effect optimized for thermal printing"""
     gray = image.convert('L')
     width, height = gray.size
+    gray_array = np.asarray(gray, dtype=np.uint8)
     
-    # Create new image for halftone
-    halftone = Image.new('L', (width, height), 255)
-    pixels = halftone.load()
-    gray_pixels = gray.load()
-    
-    for y in range(0, height, dot_size):
-        for x in range(0, width, dot_size):
-            # Calculate average brightness in block
-            total = 0
-            count = 0
-            for dy in range(min(dot_size, height - y)):
-                for dx in range(min(dot_size, width - x)):
-                    total += gray_pixels[x + dx, y + dy]
-                    count += 1
-            
-            avg = total / count if count > 0 else 255
-            
-            # Draw dot based on brightness
-            dot_radius = int((255 - avg) * dot_size / 255)
-            for dy in range(min(dot_size, height - y)):
-                for dx in range(min(dot_size, width - x)):
-                    dist = ((dx - dot_size/2)**2 + (dy - dot_size/2)**2) ** 0.5
-                    if dist <= dot_radius / 2:
-                        pixels[x + dx, y + dy] = 0
-    
-    return halftone
-
-def high_contrast_bw(image):
-    """High contrast - inverted sketch effect for perfect detail preservation"""
-    # Use the sketch effect but invert it
-    gray = image.convert('L')
-    
-    # Create inverted image
-    inverted = ImageOps.invert(gray)
-    
-    # Apply Gaussian blur to inverted image
-    blurred = inverted.filter(ImageFilter.GaussianBlur(radius=10))
-    
-    # Blend the grayscale and blurred inverted using color dodge
-    gray_array = np.array(gray, dtype=float)
-    blurred_array = np.array(blurred, dtype=float)
-    
-    # Color dodge blend mode
-    result = gray_array * 255 / (255 - blurred_array + 1e-10)
-    result = np.clip(result, 0, 255)
+    # Calculate average brightness in each block (edge blocks may be partial)
+    rows = np.arange(0, height, dot_size)
+    cols = np.arange(0, width, dot_size)
+    totals = np.add.reduceat(np.add.reduceat(gray_array, rows, axis=0, dtype=np.int64), cols, axis=1)
+    counts = np.outer(np.diff(rows, append=height), np.diff(cols, append=width))
+    avg = totals / counts
     
-    sketch = Image.fromarray(result.astype(np.uint8))
+    # Dot size per block based on brightness, spread back out to pixels
+    dot_radius = ((255 - avg) * dot_size / 255).astype(int)
+    radius = np.repeat(np.repeat(dot_radius, dot_size, axis=0), dot_size, axis=1)[:height, :width]
     
-    # Enhance contrast
-    enhancer = ImageEnhance.Contrast(sketch)
-    sketch = enhancer.enhance(2.0)
+    # Squared distance of every pixel from the centre of its block
+    off_y = np.arange(height) % dot_size - dot_size / 2
+    off_x = np.arange(width) % dot_size - dot_size / 2
+    dist_sq = off_y[:, None] ** 2 + off_x[None, :] ** 2
     
-    # Apply threshold for pure B&W (same as sketch)
-    bw_sketch = sketch.point(lambda x: 255 if x > 180 else 0)
+    # Draw dot based on brightness
+    halftone = np.where(dist_sq <= (radius / 2) ** 2, 0, 255).astype(np.uint8)
     
-    # Now invert the result to get the contrast version
-    return ImageOps.invert(bw_sketch)
+    return Image.fromarray(halftone)
+
+def high_contrast_bw(image):
+    """High contrast - inverted sketch effect for perfect detail preservation"""
+    # Invert the sketch result to get the contrast version
+    return ImageOps.invert(sketch_effect(image))
 
 def comic_effect(image):
     """Comic book/graphic novel effect with bold outlines and shading"""
@@ -205,37 +179,25 @@ def comic_effect(image):
     posterized = ImageOps.posterize(smoothed, 2)
     
     # Convert to just 3 tones: white, gray pattern, black
-    pixels = np.array(posterized)
-    result = np.zeros_like(pixels)
+    pixels = np.asarray(posterized)
     
     # Define thresholds for three zones
     dark_threshold = 85
     light_threshold = 170
     
-    # Create patterns for mid-tone
-    for y in range(pixels.shape[0]):
-        for x in range(pixels.shape[1]):
-            pixel = pixels[y, x]
-            if pixel < dark_threshold:
-                result[y, x] = 0  # Black
-            elif pixel > light_threshold:
-                result[y, x] = 255  # White
-            else:
-                # Checkerboard pattern for mid-tones
-                if (x + y) % 2 == 0:
-                    result[y, x] = 255
-                else:
-                    result[y, x] = 0
-    
-    posterized_result = Image.fromarray(result.astype(np.uint8))
+    # Checkerboard pattern for mid-tones, white where (x + y) is even
+    checker = np.where(np.indices(pixels.shape).sum(axis=0) % 2 == 0, 255, 0)
+    
+    result = np.where(pixels < dark_threshold, 0,  # Black
+                      np.where(pixels > light_threshold, 255,  # White
+                               checker))
     
     # Step 3: Combine edges with posterized areas
     # Edges override everything else
-    edge_array = np.array(edge_mask)
-    poster_array = np.array(posterized_result)
+    edge_array = np.asarray(edge_mask)
     
     # Where edges are black (0), use black; otherwise use posterized
-    final = np.where(edge_array == 0, 0, poster_array)
+    final = np.where(edge_array == 0, 0, result)
     
     return Image.fromarray(final.astype(np.uint8))
 
@@ -265,36 +227,35 @@ def lowlight_enhance(image):
     
     # Aggressive brightness boost for low-light
     # 1. Apply stronger gamma correction
-    img_array = np.array(gray, dtype=float)
-    
     # Very aggressive gamma for low light (0.4-0.5)
     gamma = 0.45
-    img_array = 255 * np.power(img_array / 255, gamma)
+    u8 = np.asarray(gray, dtype=np.uint8)
+    lut = _gamma_lut(gamma)
     
     # 2. Adaptive histogram equalization-like enhancement
     # Boost dark regions more than bright regions
-    percentile_low = np.percentile(img_array, 5)
-    percentile_high = np.percentile(img_array, 95)
+    percentile_low, percentile_high = lut[_percentiles_u8(u8, (5, 95))]
     
     # Stretch with bias toward brightening
     if percentile_high - percentile_low > 20:
-        img_array = np.clip((img_array - percentile_low) * 300 / (percentile_high - percentile_low), 0, 255)
+        lut = np.clip((lut - percentile_low) * 300 / (percentile_high - percentile_low), 0, 255)
     
-    # 3. Local contrast enhancement with stronger unsharp mask
-    img_temp = Image.fromarray(img_array.astype(np.uint8))
+    # Gamma and stretch are folded into the table, applied in one lookup
+    img_temp = gray.point(lut.astype(np.uint8).tolist())
     
+    # 3. Local contrast enhancement with stronger unsharp mask
     # Apply CLAHE-like local enhancement
     enhanced = ImageEnhance.Contrast(img_temp).enhance(1.8)
-    enhanced_array = np.array(enhanced, dtype=float)
+    enhanced_array = _to_f32(enhanced)
     
-    # Strong unsharp mask for detail recovery
-    blurred = enhanced.filter(ImageFilter.GaussianBlur(radius=3))
-    blurred_array = np.array(blurred, dtype=float)
+    # Strong unsharp mask for detail recovery, kept in float so nothing is
+    # rounded before the threshold (PIL's UnsharpMask would round to uint8)
+    blurred_array = _to_f32(enhanced.filter(ImageFilter.GaussianBlur(radius=3)))
     
     # Stronger unsharp mask
     strength = 0.8
-    enhanced_array = enhanced_array + (enhanced_array - blurred_array) * strength
-    enhanced_array = np.clip(enhanced_array, 0, 255)
+    enhanced_array += (enhanced_array - blurred_array) * strength
+    np.clip(enhanced_array, 0, 255, out=enhanced_array)
     
     # 4. Adaptive thresholding for final B&W conversion
     # Use lower threshold for dark images
@@ -302,15 +263,10 @@ def lowlight_enhance(image):
     threshold = 90 if mean_brightness < 80 else 110
     
     # Apply threshold with some dithering for smooth gradients
-    h, w = enhanced_array.shape
-    result = np.zeros_like(enhanced_array)
-    
-    for y in range(h):
-        for x in range(w):
-            # Add slight noise to prevent banding
-            noise = np.random.normal(0, 5)
-            pixel = enhanced_array[y, x] + noise
-            result[y, x] = 255 if pixel > threshold else 0
+    # Add slight noise to prevent banding
+    rng = np.random.default_rng()
+    noise = rng.standard_normal(enhanced_array.shape, dtype=np.float32) * 5
+    result = np.where(enhanced_array + noise > threshold, 255, 0)
     
     return Image.fromarray(result.astype(np.uint8))
 
@@ -319,26 +275,26 @@ def daylight_enhance(image):
     gray = image.convert('L')
     
     # For daylight, we need to preserve detail without over-brightening
-    img_array = np.array(gray, dtype=float)
-    
     # 1. Mild gamma correction to prevent washout
     gamma = 1.2  # Greater than 1 darkens the image slightly
-    img_array = 255 * np.power(img_array / 255, gamma)
+    u8 = np.asarray(gray, dtype=np.uint8)
+    lut = _gamma_lut(gamma)
     
     # 2. Increase contrast to handle bright light washout
     # Find bright spots and reduce them
-    percentile_low = np.percentile(img_array, 10)
-    percentile_high = np.percentile(img_array, 90)
+    percentile_low, percentile_high = lut[_percentiles_u8(u8, (10, 90))]
     
     # Compress dynamic range for bright images
     if percentile_high > 200:  # Very bright image
         # Apply S-curve to compress highlights
-        img_array = np.where(img_array > 180, 
-                            180 + (img_array - 180) * 0.5,  # Compress highlights
-                            img_array)
+        lut = np.where(lut > 180, 
+                       180 + (lut - 180) * 0.5,  # Compress highlights
+                       lut)
+    
+    # Gamma and highlight curve are folded into the table, applied in one lookup
+    img_temp = gray.point(lut.astype(np.uint8).tolist())
     
     # 3. Enhance mid-tone contrast
-    img_temp = Image.fromarray(img_array.astype(np.uint8))
     
     # Strong contrast enhancement for daylight
     enhanced = ImageEnhance.Contrast(img_temp).enhance(2.5)
@@ -346,7 +302,7 @@ def daylight_enhance(image):
     # Add slight sharpening for crisp details
     enhanced = enhanced.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
     
-    enhanced_array = np.array(enhanced, dtype=float)
+    enhanced_array = np.asarray(enhanced)
     
     # 4. Adaptive threshold based on image statistics
     mean_brightness = np.mean(enhanced_array)
@@ -357,33 +313,21 @@ def daylight_enhance(image):
     
     # Apply threshold with edge preservation
     edges = enhanced.filter(ImageFilter.FIND_EDGES)
-    edge_array = np.array(edges, dtype=float)
+    edge_array = np.asarray(edges)
     
     # Combine threshold with edge information
-    result = np.zeros_like(enhanced_array)
-    for y in range(enhanced_array.shape[0]):
-        for x in range(enhanced_array.shape[1]):
-            # If it's an edge, make it black
-            if edge_array[y, x] > 50:
-                result[y, x] = 0
-            else:
-                # Otherwise use adaptive threshold
-                result[y, x] = 255 if enhanced_array[y, x] > threshold else 0
+    # If it's an edge, make it black, otherwise use adaptive threshold
+    result = np.where(edge_array > 50, 0,
+                      np.where(enhanced_array > threshold, 255, 0))
     
     return Image.fromarray(result.astype(np.uint8))
 
 def process_image(input_path, output_path, method='sketch', width=576):
     """Process image with specified method"""
-    
-    # Load image
-    img = Image.open(input_path)
-    
-    # Calculate height maintaining aspect ratio
-    aspect = img.height / img.width
-    height = int(width * aspect)
-    
-    # Resize image
-    img = img.resize((width, height), Image.Resampling.LANCZOS)
+    return process_image_from_pil(load_image(input_path, width), output_path, method)
+
+def process_image_from_pil(img, output_path, method='sketch'):
+    """Process an already loaded and resized image with specified method"""
     
     # Apply selected filter
     if method == 'sketch':
@@ -447,13 +391,17 @@ def main():
     if method == 'all':
         methods = ['sketch', 'edge', 'dither', 'halftone', 'contrast', 'comic', 'woodcut', 'lowlight', 'daylight']
         print(f"Processing {input_file} with all methods...")
-        for m in methods:
-            base = Path(input_file).stem
-            ext = Path(input_file).suffix
-            output_file = f"{base}_{m}_receipt{ext}"
-            success = process_image(input_file, output_file, m)
-            if not success:
-                print(f"✗ Failed to process {m} effect")
+        # Decode and resize once for every filter
+        img = load_image(input_file)
+        base = Path(input_file).stem
+        ext = Path(input_file).suffix
+        output_files = [f"{base}_{m}_receipt{ext}" for m in methods]
+        # Filters are independent, so run them across all cores
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(partial(process_image_from_pil, img), output_files, methods)
+            for m, success in zip(methods, results):
+                if not success:
+                    print(f"✗ Failed to process {m} effect")
         print("✓ All effects processed!")
     else:
         # Generate output filename
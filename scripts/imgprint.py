@@ -7,6 +7,7 @@ Prints all images in sequence, cutting only after the last one
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path to import local modules
@@ -29,23 +30,36 @@ def print_images(image_paths):
         
         total = len(image_paths)
         
-        for i, image_path in enumerate(image_paths, 1):
-            print(f"[{i}/{total}] Printing {image_path}...")
-            
-            # Only add cuts after the last image
-            add_cuts = (i == total)
-            
-            # Print the image
-            success = printer.print_image(
-                image_path,
+        def prepare(i):
+            return printer.prepare_image(
+                image_paths[i - 1],
                 width=576,  # Full width for 80mm paper
                 dither_method='floyd_steinberg',
-                add_cuts=add_cuts
+                add_cuts=(i == total)  # Only add cuts after the last image
             )
+        
+        # Dither the next image while the current one is being sent
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(prepare, 1)
             
-            if not success:
-                print(f"✗ Failed to print {image_path}")
-                return False
+            for i, image_path in enumerate(image_paths, 1):
+                try:
+                    job = pending.result()
+                except Exception as e:
+                    print(f"✗ Failed to prepare {image_path}: {e}")
+                    return False
+                
+                if i < total:
+                    pending = pool.submit(prepare, i + 1)
+                
+                print(f"[{i}/{total}] Printing {image_path}...")
+                
+                # Print the image
+                success = printer.print_prepared(job)
+                
+                if not success:
+                    print(f"✗ Failed to print {image_path}")
+                    return False
         
         print(f"✓ All {total} images printed successfully!")
         return True
@@ -5,31 +5,106 @@ Live typing experience that prints to thermal receipt printer
 """
 
 import sys
-import os
+import queue
+import select
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
-import subprocess
 import time
 
+# Add parent directory to path to import local modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from printer.custom_printer import FullWidthPrinter
+
 # Configuration
 RECEIPT_WIDTH = 576  # Standard receipt printer width in pixels
 FONT_SIZE = 14       # Bigger font to use full width
 LINE_HEIGHT = 16     # Very tight line spacing
 MARGIN = 5           # Minimal margin to use full width
+COALESCE_WINDOW = 0.25  # Seconds to wait for more input before printing
+ATLAS_PAD = 2        # Room around atlas glyphs that overhang their cell
+TEXT_CHAR_PX = 12    # Cell width of the printer's built-in font A (--text)
+
+@lru_cache(maxsize=4)
+def _load_font(size=FONT_SIZE):
+    """Load (once per size) a nice monospace font and its ASCII glyph widths"""
+    try:
+        font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf', size)
+    except:
+        try:
+            font = ImageFont.truetype('/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf', size)
+        except:
+            font = ImageFont.load_default()
+    
+    # Cache printable ASCII glyph widths so wrapping doesn't go through
+    # FreeType for every character
+    widths = {chr(c): font.getlength(chr(c)) for c in range(32, 127)}
+    return font, widths
+
+@lru_cache(maxsize=4)
+def _glyph_atlas(size=FONT_SIZE):
+    """
+    Pre-render the printable ASCII glyphs as 1-bit masks, so fixed-pitch
+    lines can be pasted together instead of laid out by FreeType each time.
+    
+    Each mask has the glyph origin ATLAS_PAD pixels in from the left;
+    glyphs without ink (space) are left out.
+    """
+    font, _ = _load_font(size)
+    chars = [chr(c) for c in range(33, 127)]
+    boxes = [font.getbbox(ch) for ch in chars]
+    cell = (max(box[2] for box in boxes) + 2 * ATLAS_PAD,
+            max(box[3] for box in boxes) + ATLAS_PAD)
+    
+    atlas = {}
+    for ch in chars:
+        glyph = Image.new('1', cell, 0)
+        ImageDraw.Draw(glyph).text((ATLAS_PAD, 0), ch, font=font, fill=1)
+        if glyph.getbbox():
+            atlas[ch] = glyph
+    return atlas
 
 class ReceiptTypewriter:
-    def __init__(self):
-        self.printer_lib = "/home/pi/photo_booth"
+    SEPARATOR = "=" * 50  # Footer rule
+    
+    def __init__(self, text_mode=False):
+        self.printer = FullWidthPrinter()
+        # Sections print on a worker thread, so typing can go on meanwhile
+        self.print_queue = queue.Queue()
+        threading.Thread(target=self._print_worker, daemon=True).start()
         self.buffer = []  # Buffer lines until double-enter
         self.last_was_empty = False  # Track double-enter
+        # Send plain text in the printer's own font instead of rendering
+        self.text_mode = text_mode
         
-        # Try to load a nice monospace font
-        try:
-            self.font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf', FONT_SIZE)
-        except:
-            try:
-                self.font = ImageFont.truetype('/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf', FONT_SIZE)
-            except:
-                self.font = ImageFont.load_default()
+        # Font and ASCII glyph widths are shared by every typewriter this
+        # session; other characters get measured into this one's own copy
+        self.font, ascii_widths = _load_font(FONT_SIZE)
+        self.char_widths = dict(ascii_widths)
+        # With a monospace font every ASCII width is the same, so plain
+        # ASCII text can be measured by its length alone
+        self.char_px = ascii_widths['M']
+        self.monospace = len(set(ascii_widths.values())) == 1
+        if self.monospace and not text_mode:
+            self.atlas = _glyph_atlas(FONT_SIZE)
+            # Glyph advance in FreeType's 26.6 fixed point
+            self.advance_64 = round(self.char_px * 64)
+        # Printable width, and how many characters fit in it (exact for
+        # fixed-pitch text, a starting guess otherwise)
+        self.usable_px = RECEIPT_WIDTH - 2 * MARGIN
+        if text_mode:
+            # Every character takes one cell of the printer's font
+            self.max_chars = RECEIPT_WIDTH // TEXT_CHAR_PX
+        else:
+            self.max_chars = max(1, int(self.usable_px // self.char_px))
+        # Footer rule, trimmed once so it never wraps
+        self.footer_rule = self.SEPARATOR[:self.max_chars]
+        # Lines that come back (rules, sign-offs) are only rendered once
+        self.render_line = lru_cache(maxsize=128)(self._render_line)
         
         print("\n" + "="*64)
         print("    RECEIPT TYPEWRITER")
@@ -37,62 +112,183 @@ class ReceiptTypewriter:
         print("\nType and press ENTER for new lines.")
         print("Press ENTER twice to print the section.")
         print("Press Ctrl+C to finish.\n")
-        print("Line width guide (64 characters):")
-        print("1234567890" * 6 + "1234")  # 64 character ruler
-        print("-"*64 + "\n")
+        print(f"Line width guide ({self.max_chars} characters):")
+        print(("1234567890" * (self.max_chars // 10 + 1))[:self.max_chars])  # Character ruler
+        print("-" * self.max_chars + "\n")
+    
+    def char_width(self, ch):
+        """Width of a single character in pixels"""
+        width = self.char_widths.get(ch)
+        if width is None:
+            width = self.char_widths[ch] = self.font.getlength(ch)
+        return width
+    
+    def is_fixed_pitch(self, text):
+        """Check whether text can be measured by its length alone"""
+        if self.text_mode:
+            return True
+        return self.monospace and text.isascii() and text.isprintable()
+    
+    def _max_fit(self, running, start):
+        """
+        Binary-search how many characters from start fit the printable width,
+        given the line's running glyph widths (at least one if any are left).
+        """
+        base = running[start - 1] if start else 0
+        fit = bisect_right(running, base + self.usable_px, lo=start) - start
+        return min(max(fit, 1), len(running) - start)
     
-    def print_buffer(self):
-        """Print all buffered lines without cutting"""
+    def wrap_line(self, line):
+        """Split a line into pieces that fit the printable width"""
+        # Pieces of a fixed-pitch line are too, so check only once;
+        # otherwise measure each character once, as running widths
+        if self.is_fixed_pitch(line):
+            running = None
+        else:
+            running = list(accumulate(map(self.char_width, line)))
+        pieces = []
+        
+        # One forward pass: `start` moves along the line instead of the
+        # rest of the line being sliced off and re-scanned for each piece
+        start, end = 0, len(line)
+        while True:
+            if running is None:
+                fit = min(end - start, self.max_chars)
+            else:
+                fit = self._max_fit(running, start)
+            
+            if start + fit == end:
+                break
+            
+            # Break at the last space that fits
+            wrap_point = line.rfind(' ', start, start + fit)
+            if wrap_point <= start:
+                wrap_point = start + fit
+            pieces.append(line[start:wrap_point])
+            
+            # Drop the whitespace at the break
+            start = wrap_point
+            while start < end and line[start].isspace():
+                start += 1
+        
+        pieces.append(line[start:])
+        return pieces
+    
+    def blit_line(self, img, line, y, ink=0):
+        """Draw a fixed-pitch line by pasting pre-rendered glyphs"""
+        atlas = self.atlas
+        for i, ch in enumerate(line):
+            glyph = atlas.get(ch)
+            if glyph is not None:
+                # PIL rounds each glyph's 26.6 pen position to a pixel; doing
+                # the same matches draw.text exactly
+                x = MARGIN + ((i * self.advance_64 + 32) >> 6) - ATLAS_PAD
+                img.paste(ink, (x, y), glyph)
+    
+    def _render_line(self, line):
+        """
+        Render a line as a 1-bit ink mask, with its top ATLAS_PAD rows in
+        from the top; it is twice the line pitch tall, leaving room for
+        accents and descenders that reach into the neighbouring lines.
+        """
+        strip = Image.new('1', (RECEIPT_WIDTH, 2 * LINE_HEIGHT), 0)
+        if self.is_fixed_pitch(line):
+            self.blit_line(strip, line, ATLAS_PAD, ink=1)
+        else:
+            ImageDraw.Draw(strip).text((MARGIN, ATLAS_PAD), line,
+                                       font=self.font, fill=1)
+        return strip
+    
+    def input_pending(self, timeout):
+        """Check whether more input arrives on stdin within timeout seconds"""
+        try:
+            ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        except (OSError, ValueError):
+            # stdin can't be polled, so just print straight away
+            return False
+        return bool(ready)
+    
+    def print_buffer(self, add_cuts=False):
+        """Print all buffered lines, without cutting unless asked"""
         if not self.buffer:
             return
             
+        # Handle long lines by wrapping to the printable width
+        lines = []
+        for line in self.buffer:
+            lines.extend(self.wrap_line(line))
+        
+        if self.text_mode:
+            self.print_queue.put((self.text_job(lines, add_cuts), add_cuts))
+            self.buffer = []
+            return
+        
         # Calculate height for all lines (very tight)
-        total_height = len(self.buffer) * LINE_HEIGHT + 5
+        total_height = len(lines) * LINE_HEIGHT + 5
         
-        # Create image for the lines
-        img = Image.new('L', (RECEIPT_WIDTH, total_height), 255)
-        draw = ImageDraw.Draw(img)
+        # Create a 1-bit image for the lines - the printer is bilevel, and
+        # drawing in mode '1' renders the glyphs without anti-aliasing
+        img = Image.new('1', (RECEIPT_WIDTH, total_height), 1)
         
-        # Draw each line with tight spacing
+        # Stamp each line with tight spacing; masks keep overlapping
+        # descenders from being painted over by the next line
         y_pos = 2
-        for line in self.buffer:
-            # Handle long lines by wrapping
+        for line in lines:
             if line:
-                # Calculate actual width with bigger font - now allowing more chars
-                max_chars = 64  # 16 more characters (was 48)
-                while len(line) > max_chars:
-                    # Find last space before limit
-                    wrap_point = line[:max_chars].rfind(' ')
-                    if wrap_point <= 0:
-                        wrap_point = max_chars
-                    
-                    draw.text((MARGIN, y_pos), line[:wrap_point], font=self.font, fill=0)
-                    y_pos += LINE_HEIGHT
-                    line = line[wrap_point:].lstrip()
-                
-            # Draw remaining or full line
-            draw.text((MARGIN, y_pos), line, font=self.font, fill=0)
+                img.paste(0, (0, y_pos - ATLAS_PAD), self.render_line(line))
             y_pos += LINE_HEIGHT
         
-        # Save and print
-        temp_img = "/tmp/typewriter_line.png"
-        img.save(temp_img)
+        # Hand off to the print worker and clear the buffer right away
+        self.print_queue.put((img, add_cuts))
+        self.buffer = []
+    
+    def text_job(self, lines, add_cuts=False):
+        """Build raw ESC/POS for lines printed in the printer's own font"""
+        printer = self.printer
+        data = bytearray(printer.INIT + printer.ALIGN_LEFT)
+        for line in lines:
+            # The printer's default code page; unknown characters become '?'
+            data += line.encode('cp437', 'replace') + printer.FEED_LINE
         
+        # Same spacing before the cut as an image section
+        if add_cuts:
+            data += printer.FEED_LINE * 5 + printer.CUT_PAPER
+        else:
+            data += printer.FEED_LINE * 2
+        return bytes(data)
+    
+    def _print_worker(self):
+        """Print queued sections (images, or raw text jobs) in order"""
+        while True:
+            job, add_cuts = self.print_queue.get()
+            try:
+                if isinstance(job, bytes):
+                    # Text mode: feed and cut are already in the job
+                    success = self.printer.print_raw(job, quiet=True)
+                else:
+                    # Print straight from memory - no temp file or imgprint process
+                    success = self.printer.print_image(
+                        job,
+                        width=RECEIPT_WIDTH,
+                        dither_method='none',  # Already 1-bit, nothing to dither
+                        add_cuts=add_cuts,
+                        quiet=True
+                    )
+                # Stay quiet on success - the user is probably mid-line
+                if not success:
+                    print("[Print error]")
+            finally:
+                self.print_queue.task_done()
+    
+    def wait_for_prints(self):
+        """Wait for queued sections to print; Ctrl+C again gives up on them"""
         try:
-            # Use imgprint.py - it should NOT cut between lines
-            subprocess.run(
-                ["python", f"{self.printer_lib}/scripts/imgprint.py", temp_img],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            # Clear buffer after printing
-            self.buffer = []
-            print("[Printed]")
-        except subprocess.TimeoutExpired:
-            print("[Printer timeout]")
-        except Exception as e:
-            print(f"[Print error: {e}]")
+            self.print_queue.join()
+        except KeyboardInterrupt:
+            left = self.print_queue.unfinished_tasks
+            print(f"\n[Stopped - {left} queued section(s) abandoned]")
+            return False
+        return True
     
     def run(self):
         """Main loop - collect lines, print on double-enter"""
@@ -103,8 +299,11 @@ class ReceiptTypewriter:
                 
                 # Check for double-enter (print trigger)
                 if line == "" and self.last_was_empty:
-                    # Double enter - print everything
-                    if self.buffer:
+                    # Double enter - print everything, unless more text is
+                    # already coming (e.g. a paste); then the first blank
+                    # line is the break, and the sections go out together
+                    # as one print job
+                    if self.buffer and not self.input_pending(COALESCE_WINDOW):
                         self.print_buffer()
                     self.last_was_empty = False
                 else:
@@ -122,26 +321,29 @@ class ReceiptTypewriter:
             print("[Printing footer...]")
             footer_lines = [
                 "",
-                "=" * 50,
-                f"END - {time.strftime('%Y-%m-%d %H:%M')}",
-                "=" * 50,
+                self.footer_rule,
+                time.strftime('END - %Y-%m-%d %H:%M'),
+                self.footer_rule,
                 "",
                 ""  # Extra space for tear-off
             ]
             
             self.buffer = footer_lines
-            self.print_buffer()
-            print("\n[Letter complete]")
+            self.print_buffer(add_cuts=True)
+            if self.wait_for_prints():
+                print("\n[Letter complete]")
         
         except EOFError:
-            # Handle Ctrl+D - print current buffer
+            # Handle Ctrl+D - print current buffer and cut
             if self.buffer:
-                self.print_buffer()
-            print("\n[Buffer printed]")
+                self.print_buffer(add_cuts=True)
+            if self.wait_for_prints():
+                print("\n[Buffer printed]")
 
 def main():
     """Run the typewriter"""
-    typewriter = ReceiptTypewriter()
+    # --text skips rendering and prints in the printer's built-in font
+    typewriter = ReceiptTypewriter(text_mode='--text' in sys.argv[1:])
     typewriter.run()
 
 if __name__ == "__main__":